@@ -8,14 +8,39 @@ records for policy violations.
 """
 from __future__ import annotations
 
+import bisect
+import io
 import json
+import mmap
 import re
-from datetime import datetime, timedelta
+import sys
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Dict, Any
+from typing import Deque, Iterable, List, Dict, Any, Optional, Set, Tuple
+
+try:  # Optional: Hyperscan matches every PII pattern in a single SIMD pass.
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 RULES_PATH = Path(__file__).resolve().parents[1] / "config" / "complianceRules.json"
 
+_DIGIT_RE = re.compile(r"\d")
+# Characters on which Hyperscan's \b, \d and \s can disagree with Python's str patterns.
+_HYPERSCAN_UNSAFE_RE = re.compile(r"[\x1c-\x1f\x80-\U0010ffff]")
+
+# Transaction timestamps repeat often (same-minute batches), so parses are memoised.
+if sys.version_info >= (3, 11):
+    # Python 3.11+ accepts the trailing "Z" suffix natively.
+    _parse_iso = lru_cache(maxsize=4096)(datetime.fromisoformat)
+else:
+    @lru_cache(maxsize=4096)
+    def _parse_iso(value: str) -> datetime:
+        """Parse an ISO-8601 timestamp, allowing a trailing "Z" suffix."""
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
 
 def load_rules() -> Dict[str, Any]:
     """Load the compliance rules JSON file."""
@@ -23,9 +48,106 @@ def load_rules() -> Dict[str, Any]:
         return json.load(f)
 
 
-def _redact(text: str, regex: re.Pattern[str], label: str) -> str:
-    """Return text with any matching substrings replaced by a label."""
-    return regex.sub(f"<{label.upper()}_REDACTED>", text)
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO-8601 string with a "Z" suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _redaction_label(name: str) -> str:
+    """Return the placeholder substituted for matches of the named pattern."""
+    return f"<{name.upper()}_REDACTED>"
+
+
+def _redact(text: str, regex: re.Pattern[str], label: str) -> Tuple[str, int]:
+    """Return text with any matching substrings replaced by a label, plus the match count."""
+    return regex.subn(label, text)
+
+
+def _compiled_pii_patterns(rules: Dict[str, Any]) -> List[Tuple[str, re.Pattern[str], str, bool, Dict[str, Any]]]:
+    """Return the compiled PII patterns, compiling them once per rules dict.
+
+    Patterns flagged ``requiresDigit`` in the rules file are skipped for text
+    without any digit.
+    """
+    compiled = rules.get("_compiled_pii")
+    if compiled is None:
+        patterns = rules["rules"].get("pii_detection", {}).get("patterns", {})
+        compiled = [
+            (name, re.compile(cfg["regex"], re.IGNORECASE), _redaction_label(name), bool(cfg.get("requiresDigit")), cfg)
+            for name, cfg in patterns.items()
+        ]
+        rules["_compiled_pii"] = compiled
+    return compiled
+
+
+def _compiled_pii_prefilter(rules: Dict[str, Any]) -> re.Pattern[bytes]:
+    """Return a bytes regex that matches (zero-width) wherever any PII pattern starts.
+
+    Bytes-mode ``\\d`` and ``\\s`` are narrower than their str-mode forms, so any
+    non-ASCII byte (or \\x1c-\\x1f separator) also matches; those lines always go
+    through the str patterns in ``scan_text``.
+    """
+    prefilter = rules.get("_compiled_pii_prefilter")
+    if prefilter is None:
+        patterns = rules["rules"].get("pii_detection", {}).get("patterns", {})
+        alternatives = [b"(?:" + cfg["regex"].encode("utf-8") + b")" for cfg in patterns.values()]
+        alternatives.append(rb"[\x1c-\x1f\x80-\xff]")
+        alternation = b"|".join(alternatives)
+        prefilter = re.compile(b"(?=" + alternation + b")", re.IGNORECASE)
+        rules["_compiled_pii_prefilter"] = prefilter
+    return prefilter
+
+
+@lru_cache(maxsize=8)
+def _hyperscan_database(expressions: Tuple[str, ...]) -> Optional["hyperscan.Database"]:
+    """Compile a Hyperscan database for the given regexes, or None if that is not possible."""
+    if hyperscan is None:
+        return None
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[expression.encode("utf-8") for expression in expressions],
+            ids=list(range(len(expressions))),
+            flags=[flags] * len(expressions),
+        )
+    except hyperscan.error:
+        # Pattern syntax Hyperscan cannot handle; use plain re matching.
+        return None
+    return database
+
+
+def _hyperscan_pii_database(rules: Dict[str, Any]) -> Optional["hyperscan.Database"]:
+    """Return the Hyperscan database for the rules' PII patterns, shared across rules dicts.
+
+    Built from ``_compiled_pii_patterns`` so match ids index the same list ``scan_text`` walks.
+    """
+    return _hyperscan_database(tuple(regex.pattern for _, regex, *_ in _compiled_pii_patterns(rules)))
+
+
+def _hyperscan_candidates(text: str, rules: Dict[str, Any]) -> Optional[Set[int]]:
+    """Return indexes of the PII patterns present in text, or None to check every pattern."""
+    if hyperscan is None:
+        return None
+    # Hyperscan's \b, \d and \s are ASCII-only (UCP mode rejects \b), so they only
+    # agree with Python's str patterns on ASCII input without \x1c-\x1f separators.
+    if _HYPERSCAN_UNSAFE_RE.search(text):
+        return None
+    database = _hyperscan_pii_database(rules)
+    if database is None:
+        return None
+
+    found: Set[int] = set()
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Set[int]) -> None:
+        context.add(pattern_id)
+
+    try:
+        database.scan(text.encode("ascii"), match_event_handler=on_match, context=found)
+    except hyperscan.ScratchInUseError:
+        # The database has one scratch space; a concurrent scan falls back to re.
+        return None
+    return found
 
 
 def scan_text(text: str, rules: Dict[str, Any] | None = None, source: str = "logs") -> List[Dict[str, Any]]:
@@ -37,9 +159,15 @@ def scan_text(text: str, rules: Dict[str, Any] | None = None, source: str = "log
     if not pii_rules.get("enabled", False):
         return results
 
-    for name, cfg in pii_rules.get("patterns", {}).items():
-        regex = re.compile(cfg["regex"], re.IGNORECASE)
-        matches = regex.findall(text)
+    now_iso = _utc_timestamp()
+    has_digits = _DIGIT_RE.search(text) is not None
+    candidates = _hyperscan_candidates(text, rules)
+    for index, (name, regex, label, requires_digit, cfg) in enumerate(_compiled_pii_patterns(rules)):
+        if requires_digit and not has_digits:
+            continue
+        if candidates is not None and index not in candidates:
+            continue
+        content, matches = _redact(text, regex, label)
         if not matches:
             continue
 
@@ -47,12 +175,12 @@ def scan_text(text: str, rules: Dict[str, Any] | None = None, source: str = "log
             {
                 "type": "pii_detection",
                 "subtype": name,
-                "matches": len(matches),
+                "matches": matches,
                 "action": cfg.get("action", "alert"),
                 "severity": cfg.get("severity", "medium"),
                 "source": source,
-                "content": _redact(text, regex, name),
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "content": content,
+                "timestamp": now_iso,
             }
         )
 
@@ -61,12 +189,50 @@ def scan_text(text: str, rules: Dict[str, Any] | None = None, source: str = "log
 
 def scan_logs(log_lines: Iterable[str], rules: Dict[str, Any] | None = None, source: str = "logs") -> List[Dict[str, Any]]:
     """Convenience wrapper to scan multiple log lines."""
+    rules = rules or load_rules()
     findings: List[Dict[str, Any]] = []
     for line in log_lines:
         findings.extend(scan_text(line, rules=rules, source=source))
     return findings
 
 
+def scan_file(path: str | Path, rules: Dict[str, Any] | None = None, source: str = "logs") -> List[Dict[str, Any]]:
+    """Scan a log file line by line, memory-mapping it to skip lines without PII candidates.
+
+    Findings match ``scan_logs`` over the file's lines.
+    """
+    rules = rules or load_rules()
+    pii_rules = rules["rules"].get("pii_detection", {})
+    if not pii_rules.get("enabled", False) or not pii_rules.get("patterns"):
+        return []
+
+    findings: List[Dict[str, Any]] = []
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Pipes and empty files cannot be mapped; fall back to plain line scanning.
+            lines = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="\n")
+            return scan_logs((line.rstrip("\r\n") for line in lines), rules=rules, source=source)
+
+        with mm:
+            prefilter = _compiled_pii_prefilter(rules)
+            pos = 0
+            while pos < len(mm):
+                match = prefilter.search(mm, pos)
+                if match is None:
+                    break
+                start = mm.rfind(b"\n", 0, match.start()) + 1
+                end = mm.find(b"\n", match.start())
+                if end == -1:
+                    end = len(mm)
+                line = mm[start:end].rstrip(b"\r").decode("utf-8", errors="replace")
+                findings.extend(scan_text(line, rules=rules, source=source))
+                pos = end + 1
+
+    return findings
+
+
 def scan_transactions(transactions: Iterable[Dict[str, Any]], rules: Dict[str, Any] | None = None,
                        source: str = "transactions") -> List[Dict[str, Any]]:
     """Check transaction objects for high-value or high-volume anomalies."""
@@ -77,12 +243,14 @@ def scan_transactions(transactions: Iterable[Dict[str, Any]], rules: Dict[str, A
     if not fin_rules.get("enabled", False):
         return findings
     fin_cfg = fin_rules.get("rules", {})
+    now_iso = _utc_timestamp()
 
     high_value_cfg = fin_cfg.get("high_value_transaction", {})
     rapid_cfg = fin_cfg.get("rapid_transactions", {})
 
     # Prepare rolling window data if rapid transactions rule is enabled.
-    timestamps: List[datetime] = []
+    # Kept sorted so expired entries can be purged from the left.
+    timestamps: Deque[datetime] = deque()
     window_minutes = 0
     if rapid_cfg and rapid_cfg.get("timeWindow"):
         token = rapid_cfg["timeWindow"].lower()
@@ -92,18 +260,20 @@ def scan_transactions(transactions: Iterable[Dict[str, Any]], rules: Dict[str, A
             window_minutes = int(token.split("_")[0])
         else:
             window_minutes = 60
+    window = timedelta(minutes=window_minutes)
+    high_value_threshold = high_value_cfg.get("threshold", float("inf")) if high_value_cfg else float("inf")
 
     for tx in transactions:
         amount = float(tx.get("amount", 0))
         timestamp = tx.get("timestamp") or tx.get("date")
         ts = None
-        if timestamp:
+        if rapid_cfg and timestamp:
             try:
-                ts = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+                ts = _parse_iso(str(timestamp))
             except ValueError:
                 pass
 
-        if high_value_cfg and amount > high_value_cfg.get("threshold", float("inf")):
+        if amount > high_value_threshold:
             findings.append(
                 {
                     "type": "financial_compliance",
@@ -114,15 +284,19 @@ def scan_transactions(transactions: Iterable[Dict[str, Any]], rules: Dict[str, A
                     "severity": high_value_cfg.get("severity", "high"),
                     "source": source,
                     "transaction": tx,
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "timestamp": now_iso,
                 }
             )
 
         if rapid_cfg and ts:
             if window_minutes > 0:
-                cutoff = ts - timedelta(minutes=window_minutes)
-                timestamps[:] = [t for t in timestamps if t >= cutoff]
-            timestamps.append(ts)
+                cutoff = ts - window
+                while timestamps and timestamps[0] < cutoff:
+                    timestamps.popleft()
+            if timestamps and ts < timestamps[-1]:
+                bisect.insort(timestamps, ts)
+            else:
+                timestamps.append(ts)
             if rapid_cfg.get("count") and len(timestamps) > rapid_cfg["count"]:
                 findings.append(
                     {
@@ -135,7 +309,7 @@ def scan_transactions(transactions: Iterable[Dict[str, Any]], rules: Dict[str, A
                         "severity": rapid_cfg.get("severity", "critical"),
                         "source": source,
                         "transaction": tx,
-                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "timestamp": now_iso,
                     }
                 )
 
@@ -150,8 +324,8 @@ def main() -> None:
         print(f" - {finding['subtype']} ({finding['severity']}): {finding['content']}")
 
     sample_transactions = [
-        {"amount": 5000, "timestamp": datetime.utcnow().isoformat()},
-        {"amount": 15000, "timestamp": datetime.utcnow().isoformat()},
+        {"amount": 5000, "timestamp": _utc_timestamp()},
+        {"amount": 15000, "timestamp": _utc_timestamp()},
     ]
     print("\nTransaction findings:")
     for finding in scan_transactions(sample_transactions, rules):
@@ -0,0 +1,117 @@
+"""Tests for compliance_scanner (run with ``python -m unittest`` from this directory)."""
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest import mock
+
+import compliance_scanner
+
+
+def _without_timestamps(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{k: v for k, v in finding.items() if k != "timestamp"} for finding in findings]
+
+
+class ScanTextTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rules = compliance_scanner.load_rules()
+        self.patterns = self.rules["rules"]["pii_detection"]["patterns"]
+
+    def test_digit_patterns_still_match_digit_text(self) -> None:
+        findings = compliance_scanner.scan_text("SSN 123-45-6789", rules=self.rules)
+        self.assertEqual([finding["subtype"] for finding in findings], ["ssn"])
+
+    def test_digit_skip_follows_config_flag(self) -> None:
+        self.patterns["phone"]["regex"] = r"\bcall me\b"
+        self.assertEqual([f["subtype"] for f in compliance_scanner.scan_text("call me", rules=self.rules)], [])
+
+        rules = compliance_scanner.load_rules()
+        phone = rules["rules"]["pii_detection"]["patterns"]["phone"]
+        phone["regex"] = r"\bcall me\b"
+        del phone["requiresDigit"]
+        self.assertEqual([f["subtype"] for f in compliance_scanner.scan_text("call me", rules=rules)], ["phone"])
+
+
+class ScanFileTests(unittest.TestCase):
+    LINES = [
+        "User john@example.com attempted transfer with card 4111-1111-1111-1111",
+        "nothing to see here",
+        "SSN 123-45-6789 from 10.0.0.1\r",
+        "",
+        "ssn ١٢٣-٤٥-٦٧٨٩",
+        "card ٤١١١٤١١١٤١١١٤١١١ x",
+        "card 4111\x1c1111\x1c1111\x1c1111",
+        "café license AB123456",
+    ]
+
+    def setUp(self) -> None:
+        self.rules = compliance_scanner.load_rules()
+
+    def _write(self, lines: List[str]) -> str:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join(lines))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_matches_scan_logs_on_ascii_and_non_ascii_lines(self) -> None:
+        path = self._write(self.LINES)
+        expected = compliance_scanner.scan_logs([line.rstrip("\r") for line in self.LINES], rules=self.rules)
+        actual = compliance_scanner.scan_file(path, rules=self.rules)
+        self.assertEqual(_without_timestamps(actual), _without_timestamps(expected))
+        self.assertEqual(len(expected), 8)
+
+    def test_zero_width_pattern_stops_at_end_of_file(self) -> None:
+        self.rules["rules"]["pii_detection"]["patterns"]["custom"] = {"regex": r"(?:ACCT-\d+)?"}
+        lines = ["ACCT-1 first", "second"]
+        expected = compliance_scanner.scan_logs(lines, rules=self.rules)
+        # With and without a trailing newline; neither adds an empty final line.
+        for contents in (lines, lines + [""]):
+            actual = compliance_scanner.scan_file(self._write(contents), rules=self.rules)
+            self.assertEqual(_without_timestamps(actual), _without_timestamps(expected))
+
+    def test_empty_file_has_no_findings(self) -> None:
+        self.assertEqual(compliance_scanner.scan_file(self._write([]), rules=self.rules), [])
+
+
+@unittest.skipUnless(compliance_scanner.hyperscan is not None, "hyperscan is not installed")
+class HyperscanPrefilterTests(unittest.TestCase):
+    LINES = ScanFileTests.LINES + [
+        "call 555.123.4567 or mail a.b@c.io",
+        "_123-45-6789 and 4111 1111 1111 1111",
+    ]
+
+    def setUp(self) -> None:
+        self.rules = compliance_scanner.load_rules()
+
+    def test_matches_plain_re_scan(self) -> None:
+        with mock.patch.object(compliance_scanner, "_hyperscan_candidates", return_value=None):
+            expected = compliance_scanner.scan_logs(self.LINES, rules=self.rules)
+        actual = compliance_scanner.scan_logs(self.LINES, rules=self.rules)
+        self.assertEqual(_without_timestamps(actual), _without_timestamps(expected))
+
+    def test_database_is_compiled_once_for_default_rules(self) -> None:
+        compliance_scanner.scan_text("SSN 123-45-6789")
+        misses = compliance_scanner._hyperscan_database.cache_info().misses
+        compliance_scanner.scan_text("SSN 123-45-6789")
+        compliance_scanner.scan_text("card 4111-1111-1111-1111")
+        self.assertEqual(compliance_scanner._hyperscan_database.cache_info().misses, misses)
+
+    def test_pattern_ids_follow_compiled_patterns(self) -> None:
+        compliance_scanner.scan_text("SSN 123-45-6789", rules=self.rules)
+        del self.rules["rules"]["pii_detection"]["patterns"]["credit_card"]
+        findings = compliance_scanner.scan_text("SSN 123-45-6789", rules=self.rules)
+        self.assertEqual([finding["subtype"] for finding in findings], ["ssn"])
+
+    def test_scratch_in_use_falls_back_to_re(self) -> None:
+        busy = mock.Mock()
+        busy.scan.side_effect = compliance_scanner.hyperscan.ScratchInUseError("scratch in use")
+        with mock.patch.object(compliance_scanner, "_hyperscan_pii_database", return_value=busy):
+            findings = compliance_scanner.scan_text("SSN 123-45-6789", rules=self.rules)
+        self.assertEqual([finding["subtype"] for finding in findings], ["ssn"])
+
+
+if __name__ == "__main__":
+    unittest.main()